@@ -7,101 +7,154 @@ import shutil
 import msgpack
 import numpy as np
 
+# orjson is optional (pip install scipion-ed-dials[speedups]), but much
+# faster than json when it is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parts of the experiment model that do not depend on the input images.
+# They are only read when serialising, so they can be shared between calls.
+_BEAM_TEMPLATE = {
+    "direction": [0.0, 0.0, 1.0],
+    "wavelength": 0.0,
+    "divergence": 0.0,
+    "sigma_divergence": 0.0,
+    "polarization_normal": [0.0, 1.0, 0.0],
+    "polarization_fraction": 0.5,
+    "flux": 0.0,
+    "transmission": 1.0,
+}
+
+_PANEL_TEMPLATE = {
+    "name": "Panel",
+    "type": "SENSOR_PAD",
+    "fast_axis": [1.0, 0.0, 0.0],
+    "slow_axis": [0.0, -1.0, 0.0],
+    "origin": [0.0, 0.0, 0.0],
+    "raw_image_offset": [0, 0],
+    "image_size": [0, 0],
+    "pixel_size": [0.0, 0.0],
+    "trusted_range": [-1.0, 65535.0],
+    "thickness": 0.3,
+    "material": "Si",
+    "mu": 0.0,
+    "identifier": "",
+    "mask": [],
+    "gain": 1.0,
+    "pedestal": 0.0,
+    "px_mm_strategy": {"type": "SimplePxMmStrategy"},
+}
+
+_HIERARCHY_TEMPLATE = {
+    "name": "",
+    "type": "",
+    "fast_axis": [1.0, 0.0, 0.0],
+    "slow_axis": [0.0, 1.0, 0.0],
+    "origin": [0.0, 0.0, 0.0],
+    "raw_image_offset": [0, 0],
+    "image_size": [0, 0],
+    "pixel_size": [0.0, 0.0],
+    "trusted_range": [0.0, 0.0],
+    "thickness": 0.0,
+    "material": "",
+    "mu": 0.0,
+    "identifier": "",
+    "mask": [],
+    "gain": 1.0,
+    "pedestal": 0.0,
+    "px_mm_strategy": {"type": "SimplePxMmStrategy"},
+    "children": [{"panel": 0}],
+}
+
+_IDENTITY_ROTATION = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
+
+_EXPERIMENT_TEMPLATE = {
+    "__id__": "Experiment",
+    "identifier": "",
+    "beam": 0,
+    "detector": 0,
+    "goniometer": 0,
+    "scan": 0,
+    "imageset": 0,
+}
+
+_IMAGESET_TEMPLATE = {
+    "__id__": "ImageSequence",
+    "template": "",
+    "mask": "",
+    "gain": "",
+    "pedestal": "",
+    "dx": "",
+    "dy": "",
+    "params": {"dynamic_shadowing": "Auto", "multi_panel": False},
+}
+
 
 def writeJson(
-    inputImages, fn="model.expt", idname="ExperimentList", overwriteModel=False
+    inputImages,
+    fn="model.expt",
+    idname="ExperimentList",
+    overwriteModel=False,
+    pretty=False,
 ):
     if overwriteModel is False and os.path.exists(fn):
         return
-    imageList = [img.clone() for img in inputImages]
-    firstimage = imageList[0]
-    lastimage = imageList[-1]
+    # Read the per-image values in a single pass. Iterating a set reuses the
+    # same item object, so only the first image is cloned to keep it around.
+    firstimage = None
+    exposure_time = []
+    epoch = []
+    # Bind the appends once, this loop runs for every frame in the sweep
+    addExposureTime = exposure_time.append
+    addEpoch = epoch.append
+    for img in inputImages:
+        if firstimage is None:
+            firstimage = img.clone()
+        addExposureTime(img.getExposureTime())
+        addEpoch(img.getTwoTheta())
+        lastId = img.getObjId()
     templatepath = (
         f"{firstimage.getDirName()}/#####{firstimage.getExtension()}"
     )
-    origin = [
-        -firstimage.getBeamCenterMm()[0],
-        firstimage.getBeamCenterMm()[1],
-        -firstimage.getDistance(),
-    ]
-    exposure_time = []
-    epoch = []
-    for i in imageList:
-        exposure_time.append(i.getExposureTime())
-        epoch.append(i.getTwoTheta())
-    beam = [
-        {
-            "direction": [0.0, 0.0, 1.0],
-            "wavelength": firstimage.getWavelength(),
-            "divergence": 0.0,
-            "sigma_divergence": 0.0,
-            "polarization_normal": [0.0, 1.0, 0.0],
-            "polarization_fraction": 0.5,
-            "flux": 0.0,
-            "transmission": 1.0,
-        }
-    ]
+    # Read the values used more than once up front
+    beamCenter = firstimage.getBeamCenterMm()
+    origin = [-beamCenter[0], beamCenter[1], -firstimage.getDistance()]
+    wavelength = firstimage.getWavelength()
+    dim = firstimage.getDim()
+    pixelSize = firstimage.getPixelSize()
+    rotationAxis = firstimage.getRotationAxis()
+    firstId = firstimage.getObjId()
+    oscillation = firstimage.getOscillation()
+
+    beam = [{**_BEAM_TEMPLATE, "wavelength": wavelength}]
     detector = [
         {
             "panels": [
                 {
-                    "name": "Panel",
-                    "type": "SENSOR_PAD",
-                    "fast_axis": [1.0, 0.0, 0.0],
-                    "slow_axis": [0.0, -1.0, 0.0],
+                    **_PANEL_TEMPLATE,
                     "origin": origin,
-                    "raw_image_offset": [0, 0],
-                    "image_size": firstimage.getDim(),
-                    "pixel_size": [
-                        firstimage.getPixelSize(),
-                        firstimage.getPixelSize(),
-                    ],
-                    "trusted_range": [-1.0, 65535.0],
-                    "thickness": 0.3,
-                    "material": "Si",
-                    "mu": 0.0,
-                    "identifier": "",
-                    "mask": [],
-                    "gain": 1.0,
-                    "pedestal": 0.0,
-                    "px_mm_strategy": {"type": "SimplePxMmStrategy"},
+                    "image_size": dim,
+                    "pixel_size": [pixelSize, pixelSize],
                 }
             ],
-            "hierarchy": {
-                "name": "",
-                "type": "",
-                "fast_axis": [1.0, 0.0, 0.0],
-                "slow_axis": [0.0, 1.0, 0.0],
-                "origin": [0.0, 0.0, 0.0],
-                "raw_image_offset": [0, 0],
-                "image_size": [0, 0],
-                "pixel_size": [0.0, 0.0],
-                "trusted_range": [0.0, 0.0],
-                "thickness": 0.0,
-                "material": "",
-                "mu": 0.0,
-                "identifier": "",
-                "mask": [],
-                "gain": 1.0,
-                "pedestal": 0.0,
-                "px_mm_strategy": {"type": "SimplePxMmStrategy"},
-                "children": [{"panel": 0}],
-            },
+            "hierarchy": _HIERARCHY_TEMPLATE,
         }
     ]
 
-    goniometer = (
+    goniometer = [
         {
-            "rotation_axis": firstimage.getRotationAxis(),
-            "fixed_rotation": [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0],
-            "setting_rotation": [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0],
-        },
-    )
+            "rotation_axis": rotationAxis,
+            "fixed_rotation": _IDENTITY_ROTATION,
+            "setting_rotation": _IDENTITY_ROTATION,
+        }
+    ]
     scan = [
         {
-            "image_range": [firstimage.getObjId(), lastimage.getObjId()],
+            "image_range": [firstId, lastId],
             "batch_offset": 0,
-            "oscillation": firstimage.getOscillation(),
+            "oscillation": oscillation,
             "exposure_time": exposure_time,
             "epochs": epoch,
             "valid_image_ranges": {},
@@ -110,29 +163,8 @@ def writeJson(
 
     output = {
         "__id__": f"{idname}",
-        "experiment": [
-            {
-                "__id__": "Experiment",
-                "identifier": "",
-                "beam": 0,
-                "detector": 0,
-                "goniometer": 0,
-                "scan": 0,
-                "imageset": 0,
-            }
-        ],
-        "imageset": [
-            {
-                "__id__": "ImageSequence",
-                "template": templatepath,
-                "mask": "",
-                "gain": "",
-                "pedestal": "",
-                "dx": "",
-                "dy": "",
-                "params": {"dynamic_shadowing": "Auto", "multi_panel": False},
-            }
-        ],
+        "experiment": [_EXPERIMENT_TEMPLATE],
+        "imageset": [{**_IMAGESET_TEMPLATE, "template": templatepath}],
         "beam": beam,
         "detector": detector,
         "goniometer": goniometer,
@@ -142,48 +174,108 @@ def writeJson(
         "scaling_model": [],
     }
 
-    with open(fn, "w") as f:
-        f.write(json.dumps(output, indent=4))
+    _dumpJson(output, fn, pretty=pretty)
+
+
+def _dumpJson(output, fn, pretty=False):
+    # DIALS does not need the file to be human readable, and the compact
+    # encoding is much faster than pretty-printing
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(fn, "wb") as f:
+            f.write(orjson.dumps(output, option=option))
+    else:
+        # Encode the whole model first, json.dump writes every chunk. Use the
+        # same layout as orjson, so the file does not depend on which one is
+        # installed.
+        if pretty:
+            content = json.dumps(output, indent=2, ensure_ascii=False)
+        else:
+            content = json.dumps(
+                output, separators=(",", ":"), ensure_ascii=False
+            )
+        with open(fn, "w", encoding="utf-8") as f:
+            f.write(content)
+
+
+class _ReflData(dict):
+    # Reflection columns that remember the file they were read from, so that
+    # an unchanged table can be written by copying the file. The supported
+    # columns are read-only views, so the table is unchanged for as long as
+    # it holds the same column objects and the header values still match.
+    _source = None
+
+    def setSource(self, reflFile, reflFileIdentifier, version, nrows, ids):
+        # Unsupported columns are writable object arrays that could be
+        # changed in place, so tables holding them are always written out
+        if any(v.dtype == object for v in self.values()):
+            return
+        self._source = (
+            reflFile,
+            (reflFileIdentifier, version, nrows, dict(ids)),
+            dict(self),
+        )
+
+    def getSourceFile(self, reflFileIdentifier, version, nrows, ids):
+        if self._source is None:
+            return None
+        reflFile, header, columns = self._source
+        if (
+            (reflFileIdentifier, version, nrows, ids) != header
+            or self.keys() != columns.keys()
+            or any(self[k] is not v for k, v in columns.items())
+        ):
+            return None
+        return reflFile
 
 
 def readRefl(reflFile, fn="reflections.txt", **kwargs):
+    # Stream the file instead of reading it into memory in one go. The
+    # reflection table is a list of identifier, version and header, and
+    # single columns may exceed the default buffer limit of the unpacker.
     with open(reflFile, "rb") as f:
-        buf = msgpack.unpack(f, strict_map_key=False)
-
-    reflFileIdentifier = buf[0]
-    version = buf[1]
-    nrows = buf[2]["nrows"]
-    identifier_dict = buf[2]["identifiers"]
-    data_dict = buf[2]["data"]
-    data = {}
-    for k, v in data_dict.items():
-        data[k] = np.array(extractRefls(v))
+        unpacker = msgpack.Unpacker(f, strict_map_key=False, max_buffer_size=0)
+        unpacker.read_array_header()
+        reflFileIdentifier = unpacker.unpack()
+        version = unpacker.unpack()
+        header = unpacker.unpack()
+
+    nrows = header["nrows"]
+    identifier_dict = header["identifiers"]
+    data_dict = header["data"]
+    data = _ReflData(
+        # The columns are already arrays, so avoid copying them again. This
+        # makes the supported columns read-only views of the file contents,
+        # so copy a column before changing it in place.
+        (k, np.asarray(extractRefls(v)))
+        for k, v in data_dict.items()
+    )
+    data.setSource(
+        reflFile, reflFileIdentifier, version, nrows, identifier_dict
+    )
     return reflFileIdentifier, version, nrows, identifier_dict, data
 
 
+# DIALS column types mapped to the numpy type and shape of each row
+_REFL_TYPES = {
+    "int": (np.int32, ()),
+    "int6": (np.int32, (6,)),
+    "std::size_t": (np.uint64, ()),
+    "double": (np.float64, ()),
+    "vec3<double>": (np.float64, (3,)),
+}
+
+
 def extractRefls(v):
-    dtype = v[0]
-    size = v[1][0]
-    if dtype == "int":
-        data = np.frombuffer(v[1][1], dtype=np.int32)
-        assert len(data) == size
-    elif dtype == "int6":
-        data = np.frombuffer(v[1][1], dtype=np.int32)
-        assert len(data) == size * 6
-        data = data.reshape((size, 6))
-    elif dtype == "std::size_t":
-        data = np.frombuffer(v[1][1], dtype=np.uint64)
-        assert len(data) == size
-    elif dtype == "double":
-        data = np.frombuffer(v[1][1], dtype=np.float64)
-        assert len(data) == size
-    elif dtype == "vec3<double>":
-        data = np.frombuffer(v[1][1], dtype=np.float64)
-        assert len(data) == size * 3
-        data = data.reshape((size, 3))
-    else:
-        data = None
-    return data
+    try:
+        dtype, shape = _REFL_TYPES[v[0]]
+    except KeyError:
+        return None
+    size, buffer = v[1]
+    # Reshaping the buffer view checks the number of values without a copy
+    return np.frombuffer(buffer, dtype=dtype).reshape((size,) + shape)
 
 
 def compressRefl(data):
@@ -194,10 +286,8 @@ def compressRefl(data):
 def writeRefl(inputSpots, fn="reflections.refl", **kwargs):
     # Workaround to use existing file
     if type(inputSpots) is str:
-        try:
+        if not _isSameFile(inputSpots, fn):
             shutil.copy(inputSpots, fn)
-        except shutil.SameFileError:
-            pass
 
             # FIXME: Make the below implementation work
     else:
@@ -210,6 +300,18 @@ def writeRefl(inputSpots, fn="reflections.refl", **kwargs):
             data,
         ] = inputSpots
 
+        # Data read with readRefl and not changed since can simply be copied
+        if isinstance(data, _ReflData):
+            sourceFile = data.getSourceFile(
+                reflFileIdentifier, version, nrows, identifier_dict
+            )
+        else:
+            sourceFile = None
+        if sourceFile is not None:
+            if not _isSameFile(sourceFile, fn):
+                shutil.copy(sourceFile, fn)
+            return
+
         data_dict = compressRefl(data)
 
         header_dict = {
@@ -224,7 +326,10 @@ def writeRefl(inputSpots, fn="reflections.refl", **kwargs):
 
 
 def copyDialsFile(originalDialsFile, fn=None):
-    try:
+    if not _isSameFile(originalDialsFile, fn):
         shutil.copy(originalDialsFile, fn)
-    except shutil.SameFileError:
-        pass
+
+
+def _isSameFile(src, fn):
+    # Skip the copy up front when the destination already is the source
+    return bool(fn) and os.path.exists(fn) and os.path.samefile(src, fn)
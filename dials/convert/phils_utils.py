@@ -3,34 +3,58 @@
 
 import re
 
+# Numbers in the restraint inputs are separated by commas and/or whitespace
+_SEPARATORS = re.compile(r"[,\s]+")
 
-def writeRefinementPhil(fn="refinement.phil", **kwargs):
-    template = [
-        "refinement {",
-        "   parameterisation {",
-        "        beam {",
-        "            fix = all *in_spindle_plane out_spindle_plane *wavelength",
-        "            }",
-        "        crystal {",
-        "            fix = all cell orientation",
-        "            }",
-        "        detector {",
-        "            fix = all position orientation distance",
-        "            }",
-        "        goniometer {",
-        "            fix = *all in_beam_plane out_beam_plane",
-        "      }",
-        "   }",
-        "    reflections {",
-        "    outlier {",
-        "      algorithm = null *auto mcd tukey sauter_poon",
-        "    }",
-        "  }",
-        "}",
-    ]
+REFINEMENT_PHIL = """\
+refinement {
+   parameterisation {
+        beam {
+            fix = all *in_spindle_plane out_spindle_plane *wavelength
+            }
+        crystal {
+            fix = all cell orientation
+            }
+        detector {
+            fix = all position orientation distance
+            }
+        goniometer {
+            fix = *all in_beam_plane out_beam_plane
+      }
+   }
+    reflections {
+    outlier {
+      algorithm = null *auto mcd tukey sauter_poon
+    }
+  }
+}"""
+
+# Braces are doubled for str.format, {content} holds the values and sigmas
+RESTRAINTS_PHIL = """\
+refinement
+{{
+    parameterisation
+    {{
+        crystal
+        {{
+            unit_cell
+            {{
+                restraints
+                {{
+                    tie_to_target
+                    {{
+{content}
+                    }}
+                }}
+            }}
+        }}
+    }}
+}}"""
 
+
+def writeRefinementPhil(fn="refinement.phil", **kwargs):
     with open(fn, "w") as f:
-        f.write("\n".join(template))
+        f.write(REFINEMENT_PHIL)
 
 
 def writeRestraintsPhil(fn="restraints.phil", values=None, sigmas=None):
@@ -42,12 +66,12 @@ def writeRestraintsPhil(fn="restraints.phil", values=None, sigmas=None):
         # Change from string splitting numbers with any combination of
         # commas and white spaces into a list of floats
         inputList = [
-            float(s) for s in re.split(r"[,\s]", inputString.strip()) if s
+            float(s) for s in _SEPARATORS.split(inputString.strip()) if s
         ]
 
         # Ensure that the list has 6 elements by adding or removing the last entries
-        while len(inputList) < 6:
-            inputList.extend([inputList[-1]])
+        if len(inputList) < 6:
+            inputList.extend([inputList[-1]] * (6 - len(inputList)))
         del inputList[6:]
 
         # Convert the list of floats back into a string with comma as separator
@@ -58,33 +82,11 @@ def writeRestraintsPhil(fn="restraints.phil", values=None, sigmas=None):
     if values is None:
         return
 
-    contentString = [f"                        values={fixInput(values)}"]
+    contentString = f"                        values={fixInput(values)}"
     # Only add the string with sigmas if there are any specific sigmas to add
     if sigmas is not None:
-        contentString += [f"                        sigmas={fixInput(sigmas)}"]
-    finString = "\n".join(contentString)
-    template = [
-        "refinement",
-        "{",
-        "    parameterisation",
-        "    {",
-        "        crystal",
-        "        {",
-        "            unit_cell",
-        "            {",
-        "                restraints",
-        "                {",
-        "                    tie_to_target",
-        "                    {",
-        f"{finString}",
-        "                    }",
-        "                }",
-        "            }",
-        "        }",
-        "    }",
-        "}",
-    ]
+        contentString += f"\n                        sigmas={fixInput(sigmas)}"
 
     with open(fn, "w") as f:
-        f.write("\n".join(template))
+        f.write(RESTRAINTS_PHIL.format(content=contentString))
     return fn
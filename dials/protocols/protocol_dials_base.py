@@ -33,6 +33,38 @@ from pwed.protocols import EdBaseProtocol
 import dials.utils as dutils
 from dials.constants import EMBED, LOCAL, REMOTE
 
+IMAGE_GROUP_HELP = (
+    "Input in the format exp:start:end\nExclude a "
+    "range of images (start,stop) from the dataset with "
+    "experiment identifier exp  (inclusive of frames "
+    "start, stop). For the first dataset listed in "
+    "{inputsetsLabel}, the identifier exp is typically"
+    " 0. For the next it is 1, and so on.\nTo exclude "
+    "images 22, 23 and 24 from the second dataset "
+    "listed, the syntax is 1:22:24."
+)
+
+BEAM_FIX_HELP = (
+    "Whether to fix beam parameters. By default, in_spindle_plane is "
+    "selected, and one of the two parameters is fixed. If a goniometer is "
+    "present this leads to the beam orientation being restricted to a "
+    "direction in the initial spindle-beam plane. Wavelength is also fixed "
+    "by default, to allow refinement of the unit cell volume."
+)
+
+DETECTOR_FIX_HELP = (
+    "Fix detector parameters. The translational parameters (position) may "
+    "be setseparately to the orientation."
+)
+
+GONIOMETER_FIX_HELP = (
+    "Whether to fix goniometer parameters. By default, fix all. "
+    "Alternatively the setting matrix can be constrained to allow rotation "
+    "only within the spindle-beam plane or to allow rotation only around an"
+    " axis that lies in that plane. Set to None to refine the in two "
+    "orthogonal directions."
+)
+
 
 class DialsProtBase(EdBaseProtocol):
     """Base protocol for DIALS"""
@@ -60,14 +92,16 @@ class DialsProtBase(EdBaseProtocol):
     # -------------------------- UTILS functions -----------------------------
 
     def getInputModelFile(self, inputSource=None):
-        if self.getSetModel(inputSource):
-            return self.getSetModel(inputSource)
+        setModel = self.getSetModel(inputSource)
+        if setModel:
+            return setModel
         else:
             return self._getExtraPath(self.INPUT_EXPT_FILENAME)
 
     def getInputReflFile(self, inputSource=None):
-        if self.getSetRefl(inputSource):
-            return self.getSetRefl(inputSource)
+        setRefl = self.getSetRefl(inputSource)
+        if setRefl:
+            return setRefl
         else:
             return self._getExtraPath(self.INPUT_REFL_FILENAME)
 
@@ -103,37 +137,31 @@ class DialsProtBase(EdBaseProtocol):
             return "XTAL"
 
     def _getModelSources(self, inputSource=None):
-        sources = []
+        # Yield the sources one at a time, so that the callers can stop
+        # reading the input pointers as soon as they have found a file
         if inputSource is not None:
-            sources.append(inputSource)
-        try:
-            sources.append(self.inputImages.get())
-        except AttributeError:
-            pass
-        try:
-            sources.append(self.inputSpots.get())
-        except AttributeError:
-            pass
-        try:
-            sources.append(self.inputSet.get())
-        except AttributeError:
-            pass
-
-        return sources
+            yield inputSource
+        # Not every protocol defines all of the input pointers
+        for name in ("inputImages", "inputSpots", "inputSet"):
+            pointer = getattr(self, name, None)
+            if pointer is not None:
+                yield pointer.get()
 
     def getSetModel(self, inputSource=None):
         for source in self._getModelSources(inputSource):
             try:
-                if dutils.existsPath(source.getDialsModel()):
-                    return source.getDialsModel()
+                dialsModel = source.getDialsModel()
+                if dutils.existsPath(dialsModel):
+                    return dialsModel
             except TypeError:
                 pass
 
     def getSetRefl(self, inputSource=None):
         for source in self._getModelSources(inputSource):
             try:
-                if dutils.existsPath(source.getDialsRefl()):
-                    return source.getDialsRefl()
+                dialsRefl = source.getDialsRefl()
+                if dutils.existsPath(dialsRefl):
+                    return dialsRefl
             except TypeError:
                 pass
 
@@ -144,15 +172,13 @@ class DialsProtBase(EdBaseProtocol):
     def getLogOutput(self):
         return ""
 
+    # The input files only need writing when the set has no existing file,
+    # since getInput*File falls back to the extra folder in exactly that case
     def _checkWriteModel(self, inputSource=None):
-        return self.getSetModel(inputSource) != self.getInputModelFile(
-            inputSource
-        )
+        return not self.getSetModel(inputSource)
 
     def _checkWriteRefl(self, inputSource=None):
-        return self.getSetRefl(inputSource) != self.getInputReflFile(
-            inputSource
-        )
+        return not self.getSetRefl(inputSource)
 
     def _initialParams(self, program):
         # Base method that can more easily be overridden when needed
@@ -180,17 +206,17 @@ class DialsProtBase(EdBaseProtocol):
 
         # Input basic parameters
         self.info(f"Program is {program}")
-        params = self._initialParams(program)
+        params = [self._initialParams(program)]
 
-        # Update the command line with additional parameters
+        # Update the command line with additional parameters. Each part
+        # brings its own leading space, so they are joined without one.
+        params.append(self._extraParams())
 
-        params += self._extraParams()
+        params.append(self._getExtraPhilsPath())
 
-        params += self._getExtraPhilsPath()
+        params.append(self._getCLI())
 
-        params += self._getCLI()
-
-        return params
+        return "".join(params)
 
 
 class CliBase(EdBaseProtocol):
@@ -227,13 +253,7 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix all beam parameters?",
             default=False,
-            help="Whether to fix beam parameters. By default, "
-            "in_spindle_plane is selected, and one of the two "
-            "parameters is fixed. If a goniometer is present "
-            "this leads to the beam orientation being restricted"
-            " to a direction in the initial spindle-beam plane. "
-            "Wavelength is also fixed by default, to allow "
-            "refinement of the unit cell volume.",
+            help=BEAM_FIX_HELP,
         )
 
         group.addParam(
@@ -242,13 +262,7 @@ class RefineParamsBase(EdBaseProtocol):
             label="Fix beam in spindle plane?",
             default=True,
             condition="beamFixAll==False",
-            help="Whether to fix beam parameters. By default, "
-            "in_spindle_plane is selected, and one of the two "
-            "parameters is fixed. If a goniometer is present this "
-            "leads to the beam orientation being restricted to a "
-            "direction in the initial spindle-beam plane. "
-            "Wavelength is also fixed by default, to allow "
-            "refinement of the unit cell volume.",
+            help=BEAM_FIX_HELP,
         )
 
         group.addParam(
@@ -257,13 +271,7 @@ class RefineParamsBase(EdBaseProtocol):
             label="Fix beam out of spindle plane?",
             default=False,
             condition="beamFixAll==False",
-            help="Whether to fix beam parameters. By default, "
-            "in_spindle_plane is selected, and one of the two "
-            "parameters is fixed. If a goniometer is present "
-            "this leads to the beam orientation being restricted "
-            "to a direction in the initial spindle-beam plane. "
-            "Wavelength is also fixed by default, to allow "
-            "refinement of the unit cell volume.",
+            help=BEAM_FIX_HELP,
         )
 
         group.addParam(
@@ -272,13 +280,7 @@ class RefineParamsBase(EdBaseProtocol):
             label="Fix beam wavelength?",
             default=True,
             condition="beamFixAll==False",
-            help="Whether to fix beam parameters. By default, "
-            "in_spindle_plane is selected, and one of the two "
-            "parameters is fixed. If a goniometer is present this "
-            "leads to the beam orientation being restricted to a "
-            "direction in the initial spindle-beam plane. "
-            "Wavelength is also fixed by default, to allow "
-            "refinement of the unit cell volume.",
+            help=BEAM_FIX_HELP,
         )
 
         group.addParam(
@@ -312,9 +314,7 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix all detector parameters?",
             default=False,
-            help="Fix detector parameters. The translational "
-            "parameters (position) may be set"
-            "separately to the orientation.",
+            help=DETECTOR_FIX_HELP,
         )
 
         group.addParam(
@@ -322,9 +322,7 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix detector position?",
             default=False,
-            help="Fix detector parameters. The translational "
-            "parameters (position) may be set"
-            "separately to the orientation.",
+            help=DETECTOR_FIX_HELP,
             condition="detectorFixAll==False",
         )
 
@@ -333,9 +331,7 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix detector orientation?",
             default=False,
-            help="Fix detector parameters. The translational "
-            "parameters (position) may be set"
-            "separately to the orientation.",
+            help=DETECTOR_FIX_HELP,
             condition="detectorFixAll==False",
         )
 
@@ -344,9 +340,7 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix detector distance?",
             default=True,
-            help="Fix detector parameters. The translational "
-            "parameters (position) may be set"
-            "separately to the orientation.",
+            help=DETECTOR_FIX_HELP,
             condition="detectorFixAll==False",
         )
 
@@ -355,12 +349,7 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix goniometer in beam plane?",
             default=True,
-            help="Whether to fix goniometer parameters. By default,"
-            " fix all. Alternatively the setting matrix can be "
-            "constrained to allow rotation only within the spindle-"
-            "beam plane or to allow rotation only around an axis "
-            "that lies in that plane. Set to None to refine the in "
-            "two orthogonal directions.",
+            help=GONIOMETER_FIX_HELP,
         )
 
         group.addParam(
@@ -368,95 +357,58 @@ class RefineParamsBase(EdBaseProtocol):
             pwprot.BooleanParam,
             label="Fix goniometer out of beam plane?",
             default=True,
-            help="Whether to fix goniometer parameters. By default,"
-            " fix all. Alternatively the setting matrix can be "
-            "constrained to allow rotation only within the spindle-"
-            "beam plane or to allow rotation only around an axis "
-            "that lies in that plane. Set to None to refine the in "
-            "two orthogonal directions.",
+            help=GONIOMETER_FIX_HELP,
         )
 
     def getBeamFixParams(self):
-        beamfix = []
-        if (
-            self.beamFixInSpindlePlane
-            and self.beamFixOutSpindlePlane
-            and self.beamFixWavelength
-        ):
-            beamfix += "'*all in_spindle_plane out_spindle_plane wavelength'"
-        else:
-            beamfix += "'all "
-            if self.beamFixInSpindlePlane:
-                beamfix += "*"
-            beamfix += "in_spindle_plane "
-            if self.beamFixOutSpindlePlane:
-                beamfix += "*"
-            beamfix += "out_spindle_plane "
-            if self.beamFixWavelength:
-                beamfix += "*"
-            beamfix += "wavelength'"
-        beamfixparams = (
-            f" refinement.parameterisation.beam.fix={''.join(beamfix)}"
+        return _getFixParams(
+            "beam",
+            [
+                ("in_spindle_plane", self.beamFixInSpindlePlane),
+                ("out_spindle_plane", self.beamFixOutSpindlePlane),
+                ("wavelength", self.beamFixWavelength),
+            ],
         )
-        return beamfixparams
 
     def getCrystalFixParams(self):
-        crystalfix = []
-        if self.crystalFixCell and self.crystalFixOrientation:
-            crystalfix += "'*all cell orientation'"
-        else:
-            crystalfix += "'all "
-            if self.crystalFixCell:
-                crystalfix += "*"
-            crystalfix += "cell "
-            if self.crystalFixOrientation:
-                crystalfix += "*"
-            crystalfix += "orientation'"
-        crystalfixparams = (
-            f" refinement.parameterisation.crystal.fix={''.join(crystalfix)}"
+        return _getFixParams(
+            "crystal",
+            [
+                ("cell", self.crystalFixCell),
+                ("orientation", self.crystalFixOrientation),
+            ],
         )
-        return crystalfixparams
 
     def getDetectorFixParams(self):
-        detectorfix = []
-        if self.detectorFixAll or (
-            self.detectorFixPosition
-            and self.detectorFixOrientation
-            and self.detectorFixDistance
-        ):
-            detectorfix += "'*all position orientation distance'"
-        else:
-            detectorfix += "'all "
-            if self.detectorFixPosition:
-                detectorfix += "*"
-            detectorfix += "position "
-            if self.detectorFixOrientation:
-                detectorfix += "*"
-            detectorfix += "orientation "
-            if self.detectorFixDistance:
-                detectorfix += "*"
-            detectorfix += "distance'"
-        detectorfixparams = (
-            f" refinement.parameterisation.detector.fix={''.join(detectorfix)}"
+        return _getFixParams(
+            "detector",
+            [
+                ("position", self.detectorFixPosition),
+                ("orientation", self.detectorFixOrientation),
+                ("distance", self.detectorFixDistance),
+            ],
+            fixAll=self.detectorFixAll,
         )
-        return detectorfixparams
 
     def getGonioFixParams(self):
-        goniofix = []
-        if self.goniometerFixInBeamPlane and self.goniometerFixOutBeamPlane:
-            goniofix += "'*all in_beam_plane out_beam_plane'"
-        else:
-            goniofix += "'all "
-            if self.goniometerFixInBeamPlane:
-                goniofix += "*"
-            goniofix += "in_beam_plane "
-            if self.goniometerFixOutBeamPlane:
-                goniofix += "*"
-            goniofix += "out_beam_plane'"
-        goniofixparams = (
-            f" refinement.parameterisation.goniometer.fix={''.join(goniofix)}"
+        return _getFixParams(
+            "goniometer",
+            [
+                ("in_beam_plane", self.goniometerFixInBeamPlane),
+                ("out_beam_plane", self.goniometerFixOutBeamPlane),
+            ],
         )
-        return goniofixparams
+
+
+def _getFixParams(model, options, fixAll=False):
+    # Options are (name, fixed) pairs in the order DIALS lists them
+    if fixAll or all(fixed for _, fixed in options):
+        tokens = ["*all"] + [name for name, _ in options]
+    else:
+        tokens = ["all"] + [
+            f"*{name}" if fixed else name for name, fixed in options
+        ]
+    return f" refinement.parameterisation.{model}.fix='{' '.join(tokens)}'"
 
 
 class HtmlBase(EdBaseProtocol):
@@ -554,24 +506,25 @@ class HtmlBase(EdBaseProtocol):
     def _prepCommandlineReport(self):
         "Create the command line input to run dials programs"
         # Input basic parameters
-        params = (
-            f"{DialsProtBase.getOutputModelFile(self)} "
-            f"{DialsProtBase.getOutputReflFile(self)} "
-            f"output.html={HtmlBase.getOutputHtmlFile(self)} "
+        params = [
+            DialsProtBase.getOutputModelFile(self),
+            DialsProtBase.getOutputReflFile(self),
+            f"output.html={HtmlBase.getOutputHtmlFile(self)}",
             f"output.external_dependencies="
-            f"{self.extDepOptions[self.externalDependencies.get()]}"
-        )
+            f"{self.extDepOptions[self.externalDependencies.get()]}",
+        ]
 
         if self.pixelsPerBin.get():
-            params += f" pixels_per_bin={self.pixelsPerBin.get()}"
+            params.append(f"pixels_per_bin={self.pixelsPerBin.get()}")
 
         if self.centroidDiffMax.get():
-            params += f" centroid_diff_max={self.centroidDiffMax.get()}"
+            params.append(f"centroid_diff_max={self.centroidDiffMax.get()}")
 
-        if self.commandLineInputReport.get() not in (None, ""):
-            params += f" {self.commandLineInputReport.get()}"
+        commandLineInput = self.commandLineInputReport.get()
+        if commandLineInput not in (None, ""):
+            params.append(commandLineInput)
 
-        return params
+        return " ".join(params)
 
 
 class PhilBase(EdBaseProtocol):
@@ -618,410 +571,35 @@ class ImageExclusions(DialsProtBase):
             "advanced options",
         )
 
-        group.addParam(
-            "imageGroup1",
-            pwprot.StringParam,
-            label="Image group 1",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions " "in range(1,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup2",
-            pwprot.StringParam,
-            label="Image group 2",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in " "range(2,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup3",
-            pwprot.StringParam,
-            label="Image group 3",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in " "range(3,21)",
-            help=f"Input in the format exp:start:end\nExclude "
-            f"a range of images (start,stop) from the dataset "
-            f"with experiment identifier exp  (inclusive of "
-            f"frames start, stop). For the first dataset listed "
-            f"in {inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset listed, "
-            f"the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup4",
-            pwprot.StringParam,
-            label="Image group 4",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in " "range(4,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically "
-            f"0. For the next it is 1, and so on.\nTo exclude images"
-            f" 22, 23 and 24 from the second dataset listed, the "
-            f"syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup5",
-            pwprot.StringParam,
-            label="Image group 5",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range"
-            "(5,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup6",
-            pwprot.StringParam,
-            label="Image group 6",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range"
-            "(6,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup7",
-            pwprot.StringParam,
-            label="Image group 7",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range"
-            "(7, 21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup8",
-            pwprot.StringParam,
-            label="Image group 8",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(8, 21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup9",
-            pwprot.StringParam,
-            label="Image group 9",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range"
-            "(9,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup10",
-            pwprot.StringParam,
-            label="Image group 10",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(10,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup11",
-            pwprot.StringParam,
-            label="Image group 11",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(11,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup12",
-            pwprot.StringParam,
-            label="Image group 12",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(12,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup13",
-            pwprot.StringParam,
-            label="Image group 13",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(13,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup14",
-            pwprot.StringParam,
-            label="Image group 14",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(14,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup15",
-            pwprot.StringParam,
-            label="Image group 15",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(15,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup16",
-            pwprot.StringParam,
-            label="Image group 16",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(16,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup17",
-            pwprot.StringParam,
-            label="Image group 17",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(17,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup18",
-            pwprot.StringParam,
-            label="Image group 18",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(18,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup19",
-            pwprot.StringParam,
-            label="Image group 19",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(19,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
-
-        group.addParam(
-            "imageGroup20",
-            pwprot.StringParam,
-            label="Image group 20",
-            default=None,
-            allowsNull=True,
-            condition="excludeImages and numberOfExclusions in "
-            "range(20,21)",
-            help=f"Input in the format exp:start:end\nExclude a "
-            f"range of images (start,stop) from the dataset with "
-            f"experiment identifier exp  (inclusive of frames "
-            f"start, stop). For the first dataset listed in "
-            f"{inputsetsLabel}, the identifier exp is typically"
-            f" 0. For the next it is 1, and so on.\nTo exclude "
-            f"images 22, 23 and 24 from the second dataset "
-            f"listed, the syntax is 1:22:24.",
-        )
+        # The help text is the same for every group, so format it once
+        imageGroupHelp = IMAGE_GROUP_HELP.format(inputsetsLabel=inputsetsLabel)
+        for i in range(1, 21):
+            group.addParam(
+                f"imageGroup{i}",
+                pwprot.StringParam,
+                label=f"Image group {i}",
+                default=None,
+                allowsNull=True,
+                condition="excludeImages and numberOfExclusions in "
+                f"range({i},21)",
+                help=imageGroupHelp,
+            )
 
     def getExclusions(self):
         return self.numberOfExclusions.get()
 
+    def _getImageGroupParams(self):
+        # The group params belong to the instance, so look them up only once
+        imageGroupParams = self.__dict__.get("_imageGroupParams")
+        if imageGroupParams is None:
+            imageGroupParams = tuple(
+                getattr(self, f"imageGroup{i}") for i in range(1, 21)
+            )
+            self.__dict__["_imageGroupParams"] = imageGroupParams
+        return imageGroupParams
+
     def getImageExclusions(self):
-        imageGroups = []
-        if self.imageGroup1.get() is not None and self.getExclusions() >= 1:
-            imageGroups.append(self.imageGroup1)
-        if self.imageGroup2.get() is not None and self.getExclusions() >= 2:
-            imageGroups.append(self.imageGroup2)
-        if self.imageGroup3.get() is not None and self.getExclusions() >= 3:
-            imageGroups.append(self.imageGroup3)
-        if self.imageGroup4.get() is not None and self.getExclusions() >= 4:
-            imageGroups.append(self.imageGroup4)
-        if self.imageGroup5.get() is not None and self.getExclusions() >= 5:
-            imageGroups.append(self.imageGroup5)
-        if self.imageGroup6.get() is not None and self.getExclusions() >= 6:
-            imageGroups.append(self.imageGroup6)
-        if self.imageGroup7.get() is not None and self.getExclusions() >= 7:
-            imageGroups.append(self.imageGroup7)
-        if self.imageGroup8.get() is not None and self.getExclusions() >= 8:
-            imageGroups.append(self.imageGroup8)
-        if self.imageGroup9.get() is not None and self.getExclusions() >= 9:
-            imageGroups.append(self.imageGroup9)
-        if self.imageGroup10.get() is not None and self.getExclusions() >= 10:
-            imageGroups.append(self.imageGroup10)
-        if self.imageGroup11.get() is not None and self.getExclusions() >= 11:
-            imageGroups.append(self.imageGroup11)
-        if self.imageGroup12.get() is not None and self.getExclusions() >= 12:
-            imageGroups.append(self.imageGroup12)
-        if self.imageGroup13.get() is not None and self.getExclusions() >= 13:
-            imageGroups.append(self.imageGroup13)
-        if self.imageGroup14.get() is not None and self.getExclusions() >= 14:
-            imageGroups.append(self.imageGroup14)
-        if self.imageGroup15.get() is not None and self.getExclusions() >= 15:
-            imageGroups.append(self.imageGroup15)
-        if self.imageGroup16.get() is not None and self.getExclusions() >= 16:
-            imageGroups.append(self.imageGroup16)
-        if self.imageGroup17.get() is not None and self.getExclusions() >= 17:
-            imageGroups.append(self.imageGroup17)
-        if self.imageGroup18.get() is not None and self.getExclusions() >= 18:
-            imageGroups.append(self.imageGroup18)
-        if self.imageGroup19.get() is not None and self.getExclusions() >= 19:
-            imageGroups.append(self.imageGroup19)
-        if self.imageGroup20.get() is not None and self.getExclusions() >= 20:
-            imageGroups.append(self.imageGroup20)
-
-        return imageGroups
+        # Only the first numberOfExclusions groups are used
+        numberOfGroups = max(self.getExclusions() or 0, 0)
+        imageGroups = self._getImageGroupParams()[:numberOfGroups]
+        return [group for group in imageGroups if group.get() is not None]
@@ -109,11 +109,11 @@ class DialsProtImportDiffractionImages(
 
     def _getDialsOverwrites(self):
         params = ""
-        if self.getRotationAxis():
-            params += (
-                f" goniometer.axes={self.list2str(self.getRotationAxis())}"
-            )
+        rotationAxis = self.getRotationAxis()
+        if rotationAxis:
+            params += f" goniometer.axes={self.list2str(rotationAxis)}"
 
-        if self.getNewDetectorDistance() is not None:
-            params += f" distance={self.getNewDetectorDistance()}"
+        detectorDistance = self.getNewDetectorDistance()
+        if detectorDistance is not None:
+            params += f" distance={detectorDistance}"
         return params
@@ -25,6 +25,7 @@
 # *  e-mail address 'scipion@cnb.csic.es'
 # *
 # **************************************************************************
+from collections import namedtuple
 
 import pyworkflow.protocol as pwprot
 from pwed.objects import ExportFile
@@ -35,6 +36,10 @@ from dials.constants import JSON, MMCIF, MTZ, NXS, SADABS, XDS_ASCII
 from dials.objects import RunJobError
 from dials.protocols import CliBase, DialsProtBase, PhilBase
 
+_ExportFormat = namedtuple(
+    "_ExportFormat", "name fileType hkloutParam outputOption defaultName"
+)
+
 
 class DialsProtExport(EdProtExport, DialsProtBase):
     """Protocol for exporting results using Dials"""
@@ -310,8 +315,9 @@ class DialsProtExport(EdProtExport, DialsProtBase):
 
     def _summary(self):
         summary = []
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
 
         return summary
 
@@ -320,6 +326,30 @@ class DialsProtExport(EdProtExport, DialsProtBase):
     INPUT_EXPT_FILENAME = "integrated_model.expt"
     INPUT_REFL_FILENAME = "integrated_reflections.refl"
 
+    # How each export format is named, typed and written by DIALS
+    EXPORT_FORMATS = {
+        MTZ: _ExportFormat(
+            "mtz", "mtz", "mtzHklout", "mtz.hklout", "integrated_{}.mtz"
+        ),
+        SADABS: _ExportFormat(
+            "sadabs", "sad", "sadabsHklout", "sadabs.hklout", None
+        ),
+        NXS: _ExportFormat("nxs", "nxs", "nxsHklout", "nxs.hklout", None),
+        MMCIF: _ExportFormat(
+            "mmcif", "cif", "mmcifHklout", "mmcif.hklout", "integrated_{}.cif"
+        ),
+        XDS_ASCII: _ExportFormat(
+            "xds_ascii",
+            "XDS_ASCII",
+            "xdsAsciiHklout",
+            "xds_ascii.hklout",
+            None,
+        ),
+        JSON: _ExportFormat(
+            "json", "json", "jsonFilename", "json.filename", None
+        ),
+    }
+
     def _initialParams(self, program):
         # Base method that can more easily be overridden when needed
         params = (
@@ -331,115 +361,90 @@ class DialsProtExport(EdProtExport, DialsProtBase):
         return params
 
     def _extraParams(self):
-        params = ""
-        if self.exportFormat.get() is MTZ:
-            if self.mtzCombinePartials:
-                params += " mtz.combine_partials=True"
-
-            params += (
-                f" mtz.partiality_threshold="
-                f"{self.mtzPartialityThreshold.get()}"
-            )
+        # Only the options of the chosen format are added
+        getFormatParams = self.FORMAT_PARAMS.get(self.getFormat())
+        if getFormatParams is None:
+            return ""
+        # Every option brings its own leading space
+        return "".join(getFormatParams(self))
 
-            params += f" mtz.min_isigi={self.mtzMinIsigi.get()}"
-
-            if self.mtzForceStaticModel:
-                params += " mtz.force_static_model=True"
-
-            if self.mtzFilter_ice:
-                params += " mtz.filter_ice_rings=True"
+    # -------------------------- UTILS functions ------------------------------
 
-            if self.mtzDMin.get() is not None:
-                params += f" mtz.d_min={self.mtzDMin.get()}"
+    def _getMtzParams(self):
+        params = []
+        if self.mtzCombinePartials:
+            params.append(" mtz.combine_partials=True")
 
-            params += (
-                f" mtz.crystal_name="
-                f"{self.getCrystalName(self.mtzCrystalName.get())}"
-            )
-            params += f" mtz.project_name={self.getProjectName()}"
+        params.append(
+            f" mtz.partiality_threshold={self.mtzPartialityThreshold.get()}"
+        )
 
-        elif self.exportFormat.get() is SADABS:
-            if self.sadabsRun.get() != 1:
-                params += f" sadabs.run={self.sadabsRun.get()}"
+        params.append(f" mtz.min_isigi={self.mtzMinIsigi.get()}")
 
-            if self.sadabsPredict:
-                params += " sadabs.predict=True"
+        if self.mtzForceStaticModel:
+            params.append(" mtz.force_static_model=True")
 
-        elif self.exportFormat.get() is NXS:
-            params += (
-                f" nxs.instrument_name=" f"{self.nxsInstrumentName.get()}"
-            )
+        if self.mtzFilter_ice:
+            params.append(" mtz.filter_ice_rings=True")
 
-            params += (
-                f" nxs.instrument_short_name="
-                f"{self.nxsInstrumentShortName.get()}"
-            )
+        dMin = self.mtzDMin.get()
+        if dMin is not None:
+            params.append(f" mtz.d_min={dMin}")
 
-            params += f" nxs.source_name={self.nxsSourceName.get()}"
+        params.append(
+            f" mtz.crystal_name="
+            f"{self.getCrystalName(self.mtzCrystalName.get())}"
+        )
+        params.append(f" mtz.project_name={self.getProjectName()}")
+        return params
 
-            params += (
-                f" nxs.source_short_name=" f"{self.nxsSourceShortName.get()}"
-            )
+    def _getSadabsParams(self):
+        params = []
+        sadabsRun = self.sadabsRun.get()
+        if sadabsRun != 1:
+            params.append(f" sadabs.run={sadabsRun}")
 
-        elif self.exportFormat.get() is JSON:
-            if self.jsonCompact is False:
-                params += " json.compact=False"
+        if self.sadabsPredict:
+            params.append(" sadabs.predict=True")
+        return params
 
-            if self.jsonNDigits.get() != 6:
-                params += f" json.n_digits={self.jsonNDigits.get()}"
+    def _getNxsParams(self):
+        return [
+            f" nxs.instrument_name={self.nxsInstrumentName.get()}",
+            f" nxs.instrument_short_name={self.nxsInstrumentShortName.get()}",
+            f" nxs.source_name={self.nxsSourceName.get()}",
+            f" nxs.source_short_name={self.nxsSourceShortName.get()}",
+        ]
+
+    def _getJsonParams(self):
+        params = []
+        if not self.jsonCompact.get():
+            params.append(" json.compact=False")
+
+        nDigits = self.jsonNDigits.get()
+        if nDigits != 6:
+            params.append(f" json.n_digits={nDigits}")
         return params
 
-    # -------------------------- UTILS functions ------------------------------
+    # Formats without extra options are left out
+    FORMAT_PARAMS = {
+        MTZ: _getMtzParams,
+        SADABS: _getSadabsParams,
+        NXS: _getNxsParams,
+        JSON: _getJsonParams,
+    }
 
     def getFormat(self):
         return self.exportFormat.get()
 
     def getFileType(self):
-        if self.getFormat() is MTZ:
-            filetype = "mtz"
-
-        if self.getFormat() is SADABS:
-            filetype = "sad"
-
-        if self.getFormat() is NXS:
-            filetype = "nxs"
-
-        if self.getFormat() is MMCIF:
-            filetype = "cif"
-
-        if self.getFormat() is XDS_ASCII:
-            filetype = "XDS_ASCII"
-
-        if self.getFormat() is JSON:
-            filetype = "json"
-
-        return filetype
+        return self.EXPORT_FORMATS[self.getFormat()].fileType
 
     def getExport(self):
-        if self.getFormat() is MTZ:
-            if self.mtzHklout.get() == "":
-                name = f"integrated_{self.getObjId()}.mtz"
-            else:
-                name = self.mtzHklout.get()
-
-        if self.getFormat() is SADABS:
-            name = self.sadabsHklout.get()
-
-        if self.getFormat() is NXS:
-            name = self.nxsHklout.get()
-
-        if self.getFormat() is MMCIF:
-            if self.mmcifHklout.get() == "":
-                name = f"integrated_{self.getObjId()}.cif"
-            else:
-                name = self.mmcifHklout.get()
-
-        if self.getFormat() is XDS_ASCII:
-            name = self.xdsAsciiHklout.get()
-
-        if self.getFormat() is JSON:
-            name = self.jsonFilename.get()
-
+        exportFormat = self.EXPORT_FORMATS[self.getFormat()]
+        name = getattr(self, exportFormat.hkloutParam).get()
+        if exportFormat.defaultName is not None and name == "":
+            name = exportFormat.defaultName.format(self.getObjId())
         return self.outDir(name)
 
     def outDir(self, fn=None):
@@ -449,21 +454,9 @@ class DialsProtExport(EdProtExport, DialsProtBase):
             return self._getExtraPath(fn)
 
     def getOutput(self):
-        mtzStr = f"mtz.hklout={self.getExport()}"
-
-        sadabsStr = f"sadabs.hklout={self.getExport()}"
-
-        nxsStr = f"nxs.hklout={self.getExport()}"
-
-        mmcifStr = f"mmcif.hklout={self.getExport()}"
-
-        xdsAsciiStr = f"xds_ascii.hklout={self.getExport()}"
-
-        jsonStr = f"json.filename={self.getExport()}"
-
-        idx = self.getFormat()
-
-        formats = ["mtz", "sadabs", "nxs", "mmcif", "xds_ascii", "json"]
-        nameStr = [mtzStr, sadabsStr, nxsStr, mmcifStr, xdsAsciiStr, jsonStr]
-        outputString = f"format={formats[idx]} {nameStr[idx]}"
+        exportFormat = self.EXPORT_FORMATS[self.getFormat()]
+        outputString = (
+            f"format={exportFormat.name} "
+            f"{exportFormat.outputOption}={self.getExport()}"
+        )
         return outputString
@@ -318,8 +318,9 @@ class DialsProtFindSpots(EdProtFindSpots, DialsProtBase, CutRes):
 
     def _summary(self):
         summary = []
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
             summary.append("\n")
 
         if self.getLogOutput() not in (None, ""):
@@ -402,9 +403,9 @@ class DialsProtFindSpots(EdProtFindSpots, DialsProtBase, CutRes):
                     f" spotfinder.filter.untrusted.rectangle=" f"{rectangle2}"
                 )
 
-        if self.thresholdAlgorithm.get() is DISPERSION:
+        if self.thresholdAlgorithm.get() == DISPERSION:
             params += " spotfinder.threshold.algorithm=dispersion"
-        elif self.thresholdAlgorithm.get() is DISPERSION_EXTENDED:
+        elif self.thresholdAlgorithm.get() == DISPERSION_EXTENDED:
             params += " spotfinder.threshold.algorithm=dispersion_extended"
 
         if self.thresholdIntensity.get():
@@ -525,8 +525,9 @@ class DialsProtIndexSpots(EdProtIndexSpots, DialsProtBase):
 
     def _summary(self):
         summary = []
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
 
         return summary
 
@@ -183,8 +183,9 @@ class DialsProtIntegrateSpots(EdProtIntegrateSpots, DialsProtBase, CutRes):
 
     def _summary(self):
         summary = []
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
             summary.append("\n")
 
         return summary
@@ -218,7 +219,7 @@ class DialsProtIntegrateSpots(EdProtIntegrateSpots, DialsProtBase, CutRes):
 
     def _extraParams(self):
         params = ""
-        if self.useScanRanges.get() is True:
+        if self.useScanRanges.get():
             params += f" {self._createScanRanges()}"
 
         if self.nproc.get() not in (None, 1):
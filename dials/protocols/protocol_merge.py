@@ -237,8 +237,9 @@ class DialsProtMerge(EdProtMerge, DialsProtBase, CutRes):
     def _summary(self):
         summary = []
 
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
 
         if self.getDMin() is not None:
             summary.append(f"High resolution cutoff at {self.getDMin()} Å")
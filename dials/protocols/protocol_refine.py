@@ -260,8 +260,9 @@ class DialsProtRefineSpots(EdProtRefineSpots, DialsProtBase):
 
     def _summary(self):
         summary = []
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
 
         return summary
 
@@ -307,10 +308,7 @@ class DialsProtRefineSpots(EdProtRefineSpots, DialsProtBase):
     # -------------------------- UTILS functions ------------------------------
 
     def getScanVaryingCommand(self):
-        if (
-            self.scanVarying.get() is True
-            and self.useScanVaryingFromWorkflow.get() is True
-        ):
+        if self.scanVarying.get() and self.useScanVaryingFromWorkflow.get():
             return " scan_varying=True"
         elif self.scanVaryingNew.get() == SCAN_VARYING:
             return " scan_varying=True"
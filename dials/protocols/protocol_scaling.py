@@ -364,8 +364,9 @@ class DialsProtScaling(EdProtScaling, ImageExclusions, CutRes):
     def _summary(self):
         summary = []
 
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
 
         nSets = len(self.inputSets)
         if nSets > 1:
@@ -384,10 +385,10 @@ class DialsProtScaling(EdProtScaling, ImageExclusions, CutRes):
                 "Reindexed all datasets with dials.cosym before scaling"
             )
 
-        if self.filteringMethod.get() is DELTA_CC_HALF:
-            if self.ccHalfMode.get() is DATASET:
+        if self.filteringMethod.get() == DELTA_CC_HALF:
+            if self.ccHalfMode.get() == DATASET:
                 mode = "datasets"
-            elif self.ccHalfMode.get() is IMAGE_GROUP:
+            elif self.ccHalfMode.get() == IMAGE_GROUP:
                 mode = "image groups"
 
             summary.append(
@@ -488,9 +489,9 @@ class DialsProtScaling(EdProtScaling, ImageExclusions, CutRes):
                 f"{self.checkConsistentIndexing.get()}"
             )
 
-        if self.outlierRejection.get() is STANDARD:
+        if self.outlierRejection.get() == STANDARD:
             params += " outlier_rejection=standard"
-        elif self.outlierRejection.get() is SIMPLE:
+        elif self.outlierRejection.get() == SIMPLE:
             params += " outlier_rejection=simple"
 
         if self.outlierZmax.get():
@@ -498,9 +499,9 @@ class DialsProtScaling(EdProtScaling, ImageExclusions, CutRes):
 
         # Filtering
 
-        if self.filteringMethod.get() is DELTA_CC_HALF:
+        if self.filteringMethod.get() == DELTA_CC_HALF:
             params += " filtering.method=deltacchalf"
-        elif self.filteringMethod.get() is NONE:
+        elif self.filteringMethod.get() == NONE:
             params += " filtering.method=None"
 
         if self.ccHalfMaxCycles.get():
@@ -521,9 +522,9 @@ class DialsProtScaling(EdProtScaling, ImageExclusions, CutRes):
                 f"{self.ccHalfMinCompleteness.get()}"
             )
 
-        if self.ccHalfMode.get() is DATASET:
+        if self.ccHalfMode.get() == DATASET:
             params += " filtering.deltacchalf.mode=dataset"
-        elif self.ccHalfMode.get() is IMAGE_GROUP:
+        elif self.ccHalfMode.get() == IMAGE_GROUP:
             params += " filtering.deltacchalf.mode=image_group"
 
         if self.ccHalfGroupSize.get():
@@ -117,8 +117,9 @@ class DialsProtSymmetry(DialsProtBase, HtmlBase):
     def _summary(self):
         summary = []
 
-        if self.getDatasets() not in (None, ""):
-            summary.append(self.getDatasets())
+        datasets = self.getDatasets()
+        if datasets not in (None, ""):
+            summary.append(datasets)
             summary.append("\n")
 
         if self.getLogOutput() not in (None, ""):
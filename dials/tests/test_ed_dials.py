@@ -26,8 +26,13 @@
 # *
 # **************************************************************************
 
+import filecmp
+import json
 import os
+from unittest import mock
 
+import msgpack
+import numpy as np
 import pwed
 import pyworkflow as pw
 import pyworkflow.tests as pwtests
@@ -35,7 +40,12 @@ from pwed.objects import *
 from pwed.protocols import ProtImportDiffractionImages
 
 from dials.constants import *
-from dials.convert import writeRestraintsPhil
+from dials.convert import (
+    input_output_utils,
+    readRefl,
+    writeRefl,
+    writeRestraintsPhil,
+)
 from dials.protocols import *
 from dials.protocols.protocol_merge import DialsProtMerge
 
@@ -1287,3 +1297,96 @@ class TestEdDialsUtils(pwtests.BaseTest):
         values = "10,20,30,90,90,90"
         writeRestraintsPhil(fn=setFn, values=values)
         self.comparePhils(goodPhil="restraints_no_sigmas.phil", testPhil=setFn)
+
+    def writeTestRefl(self, fn, columns=None):
+        # Write a small reflection table in the DIALS msgpack layout
+        if columns is None:
+            columns = {
+                "id": ["int", [3, np.arange(3, dtype=np.int32).tobytes()]],
+                "intensity.sum.value": [
+                    "double",
+                    [3, np.array([1.5, 2.5, 3.5]).tobytes()],
+                ],
+            }
+        reflFn = self.getOutputPath(fn)
+        header = {"nrows": 3, "identifiers": {0: "abc"}, "data": columns}
+        with open(reflFn, "wb") as f:
+            f.write(msgpack.packb(["dials::af::reflection_table", 1, header]))
+        return reflFn
+
+    def test_read_refl_columns_are_read_only(self):
+        reflFn = self.writeTestRefl("read_only.refl")
+        data = readRefl(reflFn)[4]
+        np.testing.assert_array_equal(data["id"], [0, 1, 2])
+        with self.assertRaises(ValueError):
+            data["id"][0] = 5
+        # A copy can be changed
+        ids = data["id"].copy()
+        ids[0] = 5
+        self.assertEqual(ids[0], 5)
+
+    def test_write_refl_round_trip(self):
+        reflFn = self.writeTestRefl("round_trip.refl")
+
+        # An unchanged table is copied as it is
+        copyFn = self.getOutputPath("round_trip_copy.refl")
+        pw.utils.cleanPath(copyFn)
+        writeRefl(readRefl(reflFn), copyFn)
+        self.assertTrue(filecmp.cmp(reflFn, copyFn, shallow=False))
+
+        # A replaced column is written out instead of copying the source
+        replacedFn = self.getOutputPath("round_trip_replaced.refl")
+        pw.utils.cleanPath(replacedFn)
+        reflData = readRefl(reflFn)
+        reflData[4]["id"] = np.zeros(3, dtype=np.int32)
+        writeRefl(reflData, replacedFn)
+        self.assertFalse(filecmp.cmp(reflFn, replacedFn, shallow=False))
+
+        # So is a changed header
+        headerFn = self.getOutputPath("round_trip_header.refl")
+        pw.utils.cleanPath(headerFn)
+        identifier, version, nrows, identifiers, data = readRefl(reflFn)
+        writeRefl((identifier, 2, nrows, identifiers, data), headerFn)
+        self.assertFalse(filecmp.cmp(reflFn, headerFn, shallow=False))
+        self.assertEqual(readRefl(headerFn)[1], 2)
+
+        # Unsupported columns can be changed in place, so they are never
+        # copied
+        shoeboxFn = self.writeTestRefl(
+            "round_trip_shoebox.refl",
+            columns={"shoebox": ["Shoebox<>", [3, b""]]},
+        )
+        shoeboxCopyFn = self.getOutputPath("round_trip_shoebox_copy.refl")
+        pw.utils.cleanPath(shoeboxCopyFn)
+        writeRefl(readRefl(shoeboxFn), shoeboxCopyFn)
+        self.assertFalse(filecmp.cmp(shoeboxFn, shoeboxCopyFn, shallow=False))
+
+    def test_write_json_with_and_without_orjson(self):
+        if input_output_utils.orjson is None:
+            self.skipTest("orjson is not installed")
+        model = {
+            "__id__": "ExperimentList",
+            "beam": [{"direction": [0.0, 0.0, 1.0], "wavelength": 0.0251}],
+            "imageset": [{"template": "/data/lyso/#####.img", "mask": ""}],
+            "scan": [
+                {
+                    "image_range": [1, 3],
+                    "exposure_time": [0.3, 0.3, 0.3],
+                    "valid_image_ranges": {},
+                }
+            ],
+            "crystal": [],
+        }
+        # Both encoders write the same bytes, and the same values as the
+        # indent=4 layout used before
+        for pretty in (False, True):
+            orjsonFn = self.getOutputPath(f"orjson_{pretty}.expt")
+            jsonFn = self.getOutputPath(f"json_{pretty}.expt")
+            input_output_utils._dumpJson(model, orjsonFn, pretty=pretty)
+            with mock.patch.object(input_output_utils, "orjson", None):
+                input_output_utils._dumpJson(model, jsonFn, pretty=pretty)
+            self.assertTrue(filecmp.cmp(orjsonFn, jsonFn, shallow=False))
+            with open(jsonFn) as f:
+                self.assertEqual(
+                    json.load(f), json.loads(json.dumps(model, indent=4))
+                )
@@ -23,7 +23,9 @@
 # *  e-mail address 'scipion@cnb.csic.es'
 # *
 # **************************************************************************
+import functools
 import json
+import os
 import os.path as p
 import subprocess
 
@@ -50,6 +52,14 @@ def getModelDataPath(exptFile):
 
 
 def getDatasets(modelFile):
+    # Summaries ask for the datasets repeatedly, so only parse the model
+    # again when the file has changed
+    stat = os.stat(modelFile)
+    return _getDatasets(modelFile, stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _getDatasets(modelFile, mtime, size):
     datasets = getModelDataPath(modelFile)
     if len(datasets) >= 1:
         newlineDatasets = "\n".join(f"{item}" for item in datasets)
@@ -112,5 +122,12 @@ def getDialsVersion():
     return versionNumber
 
 
+@functools.lru_cache(maxsize=1)
+def _getInstalledDialsVersion():
+    # The installed version does not change while Scipion is running
+    return version.parse(getDialsVersion())
+
+
+@functools.lru_cache(maxsize=None)
 def isMinDialsVersion(minversion):
-    return version.parse(getDialsVersion()) >= version.parse(minversion)
+    return _getInstalledDialsVersion() >= version.parse(minversion)
@@ -172,6 +172,8 @@ setup(
     # projects.
     extras_require={  # Optional
         "dev": [requirements_dev],
+        # Faster writing of the experiment model files
+        "speedups": ["orjson"],
         #    'test': ['coverage'],
     },
     # If there are data files included in your packages that need to be